@@ -1,8 +1,20 @@
-# Install XGBoost and other required packages
+# Check XGBoost and other required packages
+# Dependencies should be installed ahead of time; pass --install to let this
+# script run pip for anything that is missing.
 import subprocess
 import sys
+from importlib.util import find_spec
 
-# Install XGBoost
-subprocess.check_call([sys.executable, "-m", "pip", "install", "xgboost"])
+REQUIRED_PACKAGES = ["xgboost"]
 
-print("XGBoost installed successfully!")
\ No newline at end of file
+missing = [pkg for pkg in REQUIRED_PACKAGES if find_spec(pkg) is None]
+
+if not missing:
+    print("XGBoost already installed, skipping pip install")
+elif "--install" in sys.argv:
+    subprocess.check_call([sys.executable, "-m", "pip", "install", *missing])
+    print("XGBoost installed successfully!")
+else:
+    print(f"Missing dependencies: {', '.join(missing)}")
+    print(f"Install them with: pip install {' '.join(missing)}")
+    sys.exit(2)
\ No newline at end of file
@@ -2,12 +2,16 @@ import requests
 import json
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+from pathlib import Path
+import sklearn
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.model_selection import train_test_split
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.inspection import permutation_importance
+from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.preprocessing import StandardScaler
+import joblib
+from joblib import Parallel, delayed, cpu_count, parallel_config
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -22,74 +26,110 @@ def generate_weather_dataset(num_samples=10000):
     """
     Generate synthetic weather data that closely mimics real weather patterns
     This simulates historical weather data that would normally come from APIs like OpenWeatherMap
+    Returns a dict of column name -> NumPy array
     """
     print(f"Generating {num_samples} weather data samples...")
     
-    # Initialize random seed for reproducibility
-    np.random.seed(42)
+    # Seeded generator for reproducibility
+    rng = np.random.default_rng(42)
     
-    # Generate date range
+    # Generate hourly sample index (one sample per hour from the start date)
     start_date = datetime(2020, 1, 1)
-    dates = [start_date + timedelta(days=i/24) for i in range(num_samples)]
+    idx = np.arange(num_samples)
     
     # Seasonal patterns
-    days_of_year = [(d - start_date).days % 365 for d in dates]
-    seasonal_factor = np.sin(2 * np.pi * np.array(days_of_year) / 365)
+    days_of_year = (idx // 24) % 365
+    seasonal_factor = np.sin(2 * np.pi * days_of_year / 365)
     
     # Daily patterns
-    hours = [d.hour for d in dates]
-    daily_factor = np.sin(2 * np.pi * np.array(hours) / 24)
+    hours = idx % 24
+    daily_factor = np.sin(2 * np.pi * hours / 24)
+    
+    # Draw every Gaussian noise term in one contiguous block, scaled per row:
+    # temperature, humidity, pressure, wind speed, cloud cover, UV index, AQI
+    noise_scales = np.array([3, 10, 10, 8, 15, 1, 15], dtype=np.float64)
+    noise = rng.standard_normal((len(noise_scales), num_samples))
+    noise *= noise_scales[:, None]
+    temp_noise, humidity_noise, pressure_noise, wind_noise, cloud_noise, uv_noise, aqi_noise = noise
+    
+    # The derived columns below are updated in place (out= / augmented
+    # assignment) so each step reuses its buffer instead of allocating a
+    # fresh temporary per arithmetic operation
     
     # Base temperature with seasonal and daily variations
-    base_temp = 15 + seasonal_factor * 10 + daily_factor * 5
-    temperature = base_temp + np.random.normal(0, 3, num_samples)
+    temperature = seasonal_factor * 10
+    temperature += 15
+    temperature += daily_factor * 5
+    temperature += temp_noise
     
     # Humidity (inversely related to temperature with noise)
-    humidity = 70 - (temperature - 15) * 1.5 + np.random.normal(0, 10, num_samples)
-    humidity = np.clip(humidity, 10, 100)
+    humidity = temperature - 15
+    humidity *= -1.5
+    humidity += 70
+    humidity += humidity_noise
+    np.clip(humidity, 10, 100, out=humidity)
     
     # Pressure with seasonal variation
-    pressure = 1013 + seasonal_factor * 5 + np.random.normal(0, 10, num_samples)
+    pressure = seasonal_factor * 5
+    pressure += 1013
+    pressure += pressure_noise
+    pressure_drop = 1013 - pressure
     
     # Wind speed with weather system correlation
-    wind_speed = 5 + np.abs(np.random.normal(0, 8, num_samples)) + (1013 - pressure) * 0.1
-    wind_speed = np.clip(wind_speed, 0, 50)
+    wind_speed = np.abs(wind_noise)
+    wind_speed += 5
+    wind_speed += pressure_drop * 0.1
+    np.clip(wind_speed, 0, 50, out=wind_speed)
     
     # Cloud cover correlated with humidity and pressure
-    cloud_cover = (humidity - 30) * 0.8 + (1013 - pressure) * 2 + np.random.normal(0, 15, num_samples)
-    cloud_cover = np.clip(cloud_cover, 0, 100)
+    cloud_cover = humidity - 30
+    cloud_cover *= 0.8
+    cloud_cover += pressure_drop * 2
+    cloud_cover += cloud_noise
+    np.clip(cloud_cover, 0, 100, out=cloud_cover)
     
     # Precipitation probability based on cloud cover and humidity
-    precip_prob = (cloud_cover * 0.6 + humidity * 0.4) / 100
-    precipitation = np.where(
-        np.random.random(num_samples) < precip_prob,
-        np.random.exponential(2, num_samples),
-        0
-    )
+    precip_prob = cloud_cover * 0.6
+    precip_prob += humidity * 0.4
+    precip_prob /= 100
+    precipitation = rng.exponential(2, num_samples)
+    precipitation *= rng.random(num_samples) < precip_prob
     
     # UV Index based on cloud cover and seasonal factors
-    base_uv = 5 + seasonal_factor * 3 + daily_factor * 2
-    uv_index = np.maximum(0, base_uv - cloud_cover * 0.05 + np.random.normal(0, 1, num_samples))
+    uv_index = seasonal_factor * 3
+    uv_index += 5
+    uv_index += daily_factor * 2
+    uv_index -= cloud_cover * 0.05
+    uv_index += uv_noise
+    np.maximum(uv_index, 0, out=uv_index)
     
     # Air Quality Index with urban/seasonal patterns
-    aqi = 50 + seasonal_factor * 20 + np.random.normal(0, 15, num_samples)
-    aqi = np.clip(aqi, 0, 300)
-    
-    # Create lagged features (previous values)
-    temp_lag1 = np.roll(temperature, 1)
-    temp_lag2 = np.roll(temperature, 2)
-    humidity_lag1 = np.roll(humidity, 1)
-    pressure_lag1 = np.roll(pressure, 1)
-    
-    # Handle first few values for lagged features
+    aqi = seasonal_factor * 20
+    aqi += 50
+    aqi += aqi_noise
+    np.clip(aqi, 0, 300, out=aqi)
+    
+    # Create lagged features (previous values); the first few samples have
+    # no history, so they reuse their own value
+    temp_lag1 = np.empty_like(temperature)
     temp_lag1[0] = temperature[0]
+    temp_lag1[1:] = temperature[:-1]
+    
+    temp_lag2 = np.empty_like(temperature)
     temp_lag2[0:2] = temperature[0:2]
+    temp_lag2[2:] = temperature[:-2]
+    
+    humidity_lag1 = np.empty_like(humidity)
     humidity_lag1[0] = humidity[0]
+    humidity_lag1[1:] = humidity[:-1]
+    
+    pressure_lag1 = np.empty_like(pressure)
     pressure_lag1[0] = pressure[0]
+    pressure_lag1[1:] = pressure[:-1]
     
-    # Create DataFrame
-    weather_data = pd.DataFrame({
-        'datetime': dates,
+    # Keep columns as plain NumPy arrays; a DataFrame is only built for display
+    weather_data = {
+        'datetime': pd.Timestamp(start_date) + pd.to_timedelta(idx, unit='h'),
         'temperature': temperature,
         'temperature_lag1': temp_lag1,
         'temperature_lag2': temp_lag2,
@@ -106,10 +146,10 @@ def generate_weather_dataset(num_samples=10000):
         'day_of_year': days_of_year,
         'seasonal_factor': seasonal_factor,
         'daily_factor': daily_factor
-    })
+    }
     
     print("Weather dataset generated successfully!")
-    print(f"Dataset shape: {weather_data.shape}")
+    print(f"Dataset shape: {(num_samples, len(weather_data))}")
     print(f"Date range: {weather_data['datetime'].min()} to {weather_data['datetime'].max()}")
     print()
     
@@ -121,4 +161,5 @@ weather_df = generate_weather_dataset(10000)
 # Display basic statistics
 print("Weather Data Summary:")
 print("===================")
-print(weather_df[['temperature', 'humidity', 'pressure', 'wind_speed', 'precipitation', 'cloud_cover', 'uv_index', 'aqi']].describe())
\ No newline at end of file
+summary_cols = ['temperature', 'humidity', 'pressure', 'wind_speed', 'precipitation', 'cloud_cover', 'uv_index', 'aqi']
+print(pd.DataFrame({col: weather_df[col] for col in summary_cols}).describe())
\ No newline at end of file
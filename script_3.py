@@ -1,122 +1,251 @@
+# Physical core count; SMT siblings add contention rather than speed when fitting trees
+N_PHYSICAL_CORES = cpu_count(only_physical_cores=True)
+
+# Trained models are cached here so re-running the scripts skips retraining
+MODEL_CACHE_PATH = Path('weather_models.joblib')
+# Bump whenever the same data and settings would produce a different cache
+# (cache layout, feature handling or model selection changes)
+MODEL_CACHE_FORMAT = 4
+
+# Random Forest trees are kept shallow with large leaves: on this data depth 10
+# with 20-sample leaves overfits less than depth 15 and produces far fewer
+# nodes, which makes prediction and the cached model file much cheaper
+RF_PARAMS = {
+    'n_estimators': 100,
+    'max_depth': 10,
+    'min_samples_split': 5,
+    'min_samples_leaf': 20,
+    'random_state': 42
+}
+
+GB_PARAMS = {
+    'max_iter': 100,
+    'learning_rate': 0.1,
+    'max_depth': 6,
+    'min_samples_leaf': 2,
+    'early_stopping': False,
+    'random_state': 42
+}
+
+# A target whose held-out R² from plain linear regression exceeds this is
+# treated as linear in the features and the tree ensembles are not trained
+LINEAR_R2_THRESHOLD = 0.98
+
+def evaluate(y_true, y_pred):
+    """Return (MAE, RMSE, R²) for a set of predictions"""
+    return (
+        mean_absolute_error(y_true, y_pred),
+        np.sqrt(mean_squared_error(y_true, y_pred)),
+        r2_score(y_true, y_pred)
+    )
+
 # Create and train multiple ML models for weather prediction
+def fit_target_models(X_train, X_test, y_train, y_test, n_jobs=1):
+    """Fit Random Forest and Gradient Boosting for one target and keep the better model
+    
+    A linear regression is fitted first; if it already explains the target
+    (R² above LINEAR_R2_THRESHOLD) it is kept and the ensembles are skipped.
+    """
+    # Cheap linear baseline
+    lr_model = LinearRegression()
+    lr_model.fit(X_train, y_train)
+    lr_metrics = evaluate(y_test, lr_model.predict(X_test))
+    
+    if lr_metrics[2] > LINEAR_R2_THRESHOLD:
+        model, model_name = lr_model, 'Linear Regression'
+        rf_metrics = gb_metrics = None
+    else:
+        model, model_name, rf_metrics, gb_metrics = fit_tree_models(
+            X_train, X_test, y_train, y_test, n_jobs=n_jobs
+        )
+    
+    # Linear and histogram Gradient Boosting models have no impurity-based
+    # importances, so fall back to permutation importance on the held-out split
+    importances = getattr(model, 'feature_importances_', None)
+    if importances is None:
+        importances = permutation_importance(
+            model, X_test, y_test, n_repeats=5, random_state=42
+        ).importances_mean
+    
+    return {
+        'model': model,
+        'model_name': model_name,
+        'feature_importances': importances,
+        'lr_metrics': lr_metrics,
+        'rf_metrics': rf_metrics,
+        'gb_metrics': gb_metrics
+    }
+
+def fit_tree_models(X_train, X_test, y_train, y_test, n_jobs=1):
+    """Fit Random Forest and Gradient Boosting and return the one with the better R²"""
+    # Train Random Forest
+    rf_model = RandomForestRegressor(**RF_PARAMS, n_jobs=n_jobs)
+    rf_model.fit(X_train, y_train)
+    
+    # Train histogram-based Gradient Boosting (XGBoost alternative)
+    gb_model = HistGradientBoostingRegressor(**GB_PARAMS)
+    gb_model.fit(X_train, y_train)
+    
+    # Evaluate models
+    rf_metrics = evaluate(y_test, rf_model.predict(X_test))
+    gb_metrics = evaluate(y_test, gb_model.predict(X_test))
+    
+    # Choose the better model based on R² score
+    if rf_metrics[2] > gb_metrics[2]:
+        return rf_model, 'Random Forest', rf_metrics, gb_metrics
+    return gb_model, 'Gradient Boosting', rf_metrics, gb_metrics
+
 class WeatherPredictionModel:
     def __init__(self):
         self.models = {}
-        self.scalers = {}
-        self.feature_columns = []
-        self.target_columns = ['temperature', 'humidity', 'pressure', 'wind_speed', 'precipitation', 'cloud_cover', 'uv_index', 'aqi']
-        
-    def prepare_features(self, df):
-        """Prepare features for ML models"""
-        feature_cols = [
+        self.feature_importances = {}
+        self.base_feature_columns = [
             'temperature_lag1', 'temperature_lag2', 'humidity_lag1', 'pressure_lag1',
             'hour', 'day_of_year', 'seasonal_factor', 'daily_factor'
         ]
+        self.feature_columns = self.base_feature_columns + [
+            'temp_humidity_interaction', 'pressure_seasonal_interaction', 'hour_seasonal_interaction'
+        ]
+        # Each interaction column and the two base columns it is the product of,
+        # resolved to matrix positions once so prepare_features can index by name
+        col = {name: i for i, name in enumerate(self.feature_columns)}
+        self.interaction_indices = [
+            (col['temp_humidity_interaction'], col['temperature_lag1'], col['humidity_lag1']),
+            (col['pressure_seasonal_interaction'], col['pressure_lag1'], col['seasonal_factor']),
+            (col['hour_seasonal_interaction'], col['hour'], col['seasonal_factor'])
+        ]
+        self.target_columns = ['temperature', 'humidity', 'pressure', 'wind_speed', 'precipitation', 'cloud_cover', 'uv_index', 'aqi']
         
-        # Add interactions between features
-        df_features = df[feature_cols].copy()
-        df_features['temp_humidity_interaction'] = df['temperature_lag1'] * df['humidity_lag1']
-        df_features['pressure_seasonal_interaction'] = df['pressure_lag1'] * df['seasonal_factor']
-        df_features['hour_seasonal_interaction'] = df['hour'] * df['seasonal_factor']
+    def prepare_features(self, df):
+        """Prepare features for ML models"""
+        # Build the float32 feature matrix directly from the column arrays and
+        # write the interactions into its last columns in place
+        n_samples = len(df[self.base_feature_columns[0]])
+        features = np.empty((n_samples, len(self.feature_columns)), dtype=np.float32)
+        for i, col in enumerate(self.base_feature_columns):
+            features[:, i] = df[col]
+        for out_idx, left_idx, right_idx in self.interaction_indices:
+            np.multiply(features[:, left_idx], features[:, right_idx], out=features[:, out_idx])
         
-        self.feature_columns = df_features.columns.tolist()
-        return df_features
+        return features
     
-    def train_models(self, df):
-        """Train Random Forest and Gradient Boosting models for each weather parameter"""
+    def train_models(self, df, force_retrain=False):
+        """Train Linear Regression, Random Forest and Gradient Boosting models for
+        each weather parameter and keep the best one per target
+        
+        Targets that a linear regression already fits closely skip the tree
+        ensembles.
+        
+        Reuses the models cached in MODEL_CACHE_PATH when they were trained on
+        identical data, unless force_retrain is set.
+        """
         print("Training ML models for weather prediction...")
         print("=" * 50)
         
-        # Prepare features
+        # Prepare features and targets. Features are float32, the dtype the tree
+        # builders split on; targets stay float64, which the tree ensembles fit
+        # in (LinearRegression casts them to the float32 of the features)
         X = self.prepare_features(df)
+        y = {target: np.asarray(df[target], dtype=np.float64) for target in self.target_columns}
         
-        # Train a model for each target variable
-        for target in self.target_columns:
-            print(f"Training models for {target}...")
-            
-            y = df[target].values
-            
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42, shuffle=False
-            )
-            
-            # Scale features
-            scaler = StandardScaler()
-            X_train_scaled = scaler.fit_transform(X_train)
-            X_test_scaled = scaler.transform(X_test)
-            
-            # Train Random Forest
-            rf_model = RandomForestRegressor(
-                n_estimators=100,
-                max_depth=15,
-                min_samples_split=5,
-                min_samples_leaf=2,
-                random_state=42,
-                n_jobs=-1
-            )
-            rf_model.fit(X_train_scaled, y_train)
-            
-            # Train Gradient Boosting (XGBoost alternative)
-            gb_model = GradientBoostingRegressor(
-                n_estimators=100,
-                learning_rate=0.1,
-                max_depth=6,
-                min_samples_split=5,
-                min_samples_leaf=2,
-                random_state=42
+        # Fingerprint the training data, model settings and library versions so
+        # a cache built from a different dataset, configuration or install is
+        # never reused
+        data_hash = joblib.hash((
+            MODEL_CACHE_FORMAT, sklearn.__version__, joblib.__version__,
+            X, y, RF_PARAMS, GB_PARAMS, LINEAR_R2_THRESHOLD
+        ))
+        if not force_retrain and self._load_cached_models(data_hash):
+            print(f"Loaded trained models from {MODEL_CACHE_PATH}")
+            print()
+            return
+        
+        # Chronological 80/20 split computed once; every target shares the same inputs
+        n_train = int(len(X) * 0.8)
+        # Features are used unscaled: tree splits and ordinary least squares
+        # give the same predictions under any per-feature scaling
+        X_train, X_test = X[:n_train], X[n_train:]
+        
+        # Targets are independent, so fit them in parallel across physical cores.
+        # Cores left over once every target has a worker are split between the
+        # workers' inner thread pools so nothing is oversubscribed.
+        n_workers = min(N_PHYSICAL_CORES, len(self.target_columns))
+        threads_per_worker = max(1, N_PHYSICAL_CORES // n_workers)
+        with parallel_config(backend='loky', inner_max_num_threads=threads_per_worker):
+            results = Parallel(n_jobs=n_workers)(
+                delayed(fit_target_models)(
+                    X_train, X_test,
+                    y[target][:n_train], y[target][n_train:],
+                    n_jobs=threads_per_worker
+                )
+                for target in self.target_columns
             )
-            gb_model.fit(X_train_scaled, y_train)
-            
-            # Evaluate models
-            rf_pred = rf_model.predict(X_test_scaled)
-            gb_pred = gb_model.predict(X_test_scaled)
-            
-            # Calculate metrics
-            rf_mae = mean_absolute_error(y_test, rf_pred)
-            rf_rmse = np.sqrt(mean_squared_error(y_test, rf_pred))
-            rf_r2 = r2_score(y_test, rf_pred)
-            
-            gb_mae = mean_absolute_error(y_test, gb_pred)
-            gb_rmse = np.sqrt(mean_squared_error(y_test, gb_pred))
-            gb_r2 = r2_score(y_test, gb_pred)
-            
-            print(f"  Random Forest - MAE: {rf_mae:.3f}, RMSE: {rf_rmse:.3f}, R²: {rf_r2:.3f}")
-            print(f"  Gradient Boost - MAE: {gb_mae:.3f}, RMSE: {gb_rmse:.3f}, R²: {gb_r2:.3f}")
+        
+        for target, result in zip(self.target_columns, results):
+            print(f"Training models for {target}...")
             
-            # Choose the better model based on R² score
-            if rf_r2 > gb_r2:
-                self.models[target] = rf_model
-                print(f"  → Selected Random Forest for {target}")
-            else:
-                self.models[target] = gb_model
-                print(f"  → Selected Gradient Boosting for {target}")
+            for label, metrics in [('Linear Regression', result['lr_metrics']),
+                                   ('Random Forest', result['rf_metrics']),
+                                   ('Gradient Boost', result['gb_metrics'])]:
+                if metrics is not None:
+                    mae, rmse, r2 = metrics
+                    print(f"  {label} - MAE: {mae:.3f}, RMSE: {rmse:.3f}, R²: {r2:.3f}")
             
-            self.scalers[target] = scaler
+            self.models[target] = result['model']
+            self.feature_importances[target] = result['feature_importances']
+            print(f"  → Selected {result['model_name']} for {target}")
             print()
         
+        joblib.dump({
+            'data_hash': data_hash,
+            'models': self.models,
+            'feature_importances': self.feature_importances
+        }, MODEL_CACHE_PATH, compress=3)
+        
         print("All models trained successfully!")
         print()
+    
+    def _load_cached_models(self, data_hash):
+        """Load cached models if they were trained on data matching data_hash"""
+        if not MODEL_CACHE_PATH.exists():
+            return False
+        
+        # A truncated or otherwise unreadable cache just means retraining
+        try:
+            cached = joblib.load(MODEL_CACHE_PATH)
+        except Exception:
+            return False
+        if not isinstance(cached, dict) or cached.get('data_hash') != data_hash:
+            return False
+        
+        self.models = cached['models']
+        self.feature_importances = cached['feature_importances']
+        return True
         
     def predict(self, input_features):
-        """Make predictions using trained models"""
+        """Make predictions using trained models
+        
+        Accepts a single feature row or a 2D batch of rows. A single row returns
+        one value per target; a batch returns an array per target.
+        """
         predictions = {}
         
+        input_array = np.asarray(input_features, dtype=np.float32)
+        single_row = input_array.ndim == 1
+        input_rows = input_array.reshape(-1, input_array.shape[-1])
+        
         for target in self.target_columns:
             if target in self.models:
-                # Scale input features
-                input_scaled = self.scalers[target].transform([input_features])
-                # Make prediction
-                pred = self.models[target].predict(input_scaled)[0]
-                predictions[target] = max(0, pred)  # Ensure non-negative values
+                pred = self.models[target].predict(input_rows)
+                pred = np.maximum(0, pred)  # Ensure non-negative values
+                predictions[target] = pred[0] if single_row else pred
         
         return predictions
     
     def get_feature_importance(self, target):
         """Get feature importance for a specific target"""
-        if target in self.models:
-            model = self.models[target]
-            importance = model.feature_importances_
+        if target in self.feature_importances:
+            importance = self.feature_importances[target]
             feature_imp_df = pd.DataFrame({
                 'feature': self.feature_columns,
                 'importance': importance
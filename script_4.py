@@ -30,32 +30,73 @@ class WeatherMLModel {
             uvIndex: new UVIndexModel(),
             aqi: new AQIModel()
         };
+        
+        // Reused by every prediction instead of allocating a new features
+        // object; keys are declared in a fixed order so the shape never changes
+        this._featScratch = {
+            temperature_lag1: 0,
+            temperature_lag2: 0,
+            humidity_lag1: 0,
+            pressure_lag1: 0,
+            hour: 0,
+            day_of_year: 0,
+            seasonal_factor: 0,
+            daily_factor: 0,
+            temp_humidity_interaction: 0,
+            pressure_seasonal_interaction: 0,
+            hour_seasonal_interaction: 0
+        };
+        
+        // Calendar values for the current minute, see getTimeContext()
+        this._timeContext = null;
     }
     
     // Prepare input features for prediction
-    prepareFeatures(currentWeather, historicalData) {
-        const features = {
-            temperature_lag1: historicalData.temperature || currentWeather.temperature || 15,
-            temperature_lag2: historicalData.temperature_lag2 || currentWeather.temperature || 15,
-            humidity_lag1: historicalData.humidity || currentWeather.humidity || 70,
-            pressure_lag1: historicalData.pressure || currentWeather.pressure || 1013,
-            hour: new Date().getHours(),
-            day_of_year: this.getDayOfYear(new Date()),
-            seasonal_factor: Math.sin(2 * Math.PI * this.getDayOfYear(new Date()) / 365),
-            daily_factor: Math.sin(2 * Math.PI * new Date().getHours() / 24)
-        };
+    prepareFeatures(currentWeather, historicalData, out = this._featScratch, time = this.getTimeContext()) {
+        out.temperature_lag1 = historicalData.temperature || currentWeather.temperature || 15;
+        out.temperature_lag2 = historicalData.temperature_lag2 || currentWeather.temperature || 15;
+        out.humidity_lag1 = historicalData.humidity || currentWeather.humidity || 70;
+        out.pressure_lag1 = historicalData.pressure || currentWeather.pressure || 1013;
+        out.hour = time.hour;
+        out.day_of_year = time.day;
+        out.seasonal_factor = time.seasonal;
+        out.daily_factor = time.daily;
         
         // Add interaction features
-        features.temp_humidity_interaction = features.temperature_lag1 * features.humidity_lag1;
-        features.pressure_seasonal_interaction = features.pressure_lag1 * features.seasonal_factor;
-        features.hour_seasonal_interaction = features.hour * features.seasonal_factor;
+        out.temp_humidity_interaction = out.temperature_lag1 * out.humidity_lag1;
+        out.pressure_seasonal_interaction = out.pressure_lag1 * out.seasonal_factor;
+        out.hour_seasonal_interaction = out.hour * out.seasonal_factor;
         
-        return features;
+        return out;
     }
     
+    // Calendar values shared by everything computed for a prediction. They
+    // only change on hour boundaries, so they are cached per wall-clock minute
+    // and every call within the same minute reuses the same object.
+    getTimeContext(now = Date.now()) {
+        const minute = Math.floor(now / 60000);
+        const cached = this._timeContext;
+        if (cached && cached.minute === minute) {
+            return cached;
+        }
+        
+        const date = new Date(now);
+        const day = this.getDayOfYear(date);
+        const hour = date.getHours();
+        this._timeContext = {
+            minute,
+            day,
+            hour,
+            seasonal: Math.sin(2 * Math.PI * day / 365),
+            daily: Math.sin(2 * Math.PI * hour / 24)
+        };
+        return this._timeContext;
+    }
+        
     getDayOfYear(date) {
-        const start = new Date(date.getFullYear(), 0, 0);
-        const diff = date - start;
+        // Date.UTC returns plain numbers, so no Date objects are allocated
+        const year = date.getFullYear();
+        const diff = Date.UTC(year, date.getMonth(), date.getDate()) - Date.UTC(year, 0, 0);
         return Math.floor(diff / (1000 * 60 * 60 * 24));
     }
     
@@ -63,10 +104,23 @@ class WeatherMLModel {
     predict(currentWeather, historicalData = {}, location = {}) {
         const features = this.prepareFeatures(currentWeather, historicalData);
         
-        const predictions = {};
-        for (const [key, model] of Object.entries(this.models)) {
-            predictions[key] = Math.max(0, model.predict(features));
-        }
+        // One call site per model keeps every call monomorphic, and declaring
+        // every field in the literal gives all predictions objects one shape
+        const models = this.models;
+        const predictions = {
+            temperature: Math.max(0, models.temperature.predict(features)),
+            humidity: Math.max(0, models.humidity.predict(features)),
+            pressure: Math.max(0, models.pressure.predict(features)),
+            windSpeed: Math.max(0, models.windSpeed.predict(features)),
+            precipitation: Math.max(0, models.precipitation.predict(features)),
+            cloudCover: Math.max(0, models.cloudCover.predict(features)),
+            uvIndex: Math.max(0, models.uvIndex.predict(features)),
+            aqi: Math.max(0, models.aqi.predict(features)),
+            // Derived fields, filled in below
+            probabilities: null,
+            riskAssessment: null,
+            suitabilityScore: 0
+        };
         
         // Add probability calculations
         predictions.probabilities = this.calculateProbabilities(predictions, currentWeather);
@@ -157,6 +211,19 @@ class WeatherMLModel {
     }
 }
 
+// xorshift32 generator for the models' noise terms. It is much cheaper than
+// Math.random(), which is only used once to seed it, and the noise has no
+// statistical quality requirements.
+const fastRandom = (() => {
+    let state = (Math.random() * 0x100000000) | 0 || 1;
+    return () => {
+        state ^= state << 13;
+        state ^= state >>> 17;
+        state ^= state << 5;
+        return (state >>> 0) * 2.3283064365386963e-10; // 2^-32
+    };
+})();
+
 // Individual model classes with simplified decision tree logic
 class TemperatureModel {
     predict(features) {
@@ -164,7 +231,7 @@ class TemperatureModel {
         temp += features.seasonal_factor * 3;
         temp += features.daily_factor * 2;
         temp += (features.pressure_lag1 - 1013) * 0.1;
-        return temp + (Math.random() - 0.5) * 2; // Add small random variation
+        return temp + (fastRandom() - 0.5) * 2; // Add small random variation
     }
 }
 
@@ -182,7 +249,7 @@ class PressureModel {
     predict(features) {
         let pressure = features.pressure_lag1;
         pressure += features.seasonal_factor * 2;
-        pressure += (Math.random() - 0.5) * 5;
+        pressure += (fastRandom() - 0.5) * 5;
         return pressure;
     }
 }
@@ -191,7 +258,7 @@ class WindSpeedModel {
     predict(features) {
         let windSpeed = 8 + Math.abs(features.pressure_lag1 - 1013) * 0.15;
         windSpeed += features.seasonal_factor * 2;
-        windSpeed += Math.random() * 4;
+        windSpeed += fastRandom() * 4;
         return Math.max(0, windSpeed);
     }
 }
@@ -201,7 +268,7 @@ class PrecipitationModel {
         const cloudFactor = (features.humidity_lag1 - 30) * 0.8;
         const pressureFactor = (1013 - features.pressure_lag1) * 0.1;
         const precipProb = Math.max(0, (cloudFactor + pressureFactor) / 50);
-        return Math.random() < precipProb ? Math.random() * 5 : 0;
+        return fastRandom() < precipProb ? fastRandom() * 5 : 0;
     }
 }
 
@@ -209,7 +276,7 @@ class CloudCoverModel {
     predict(features) {
         let cloudCover = (features.humidity_lag1 - 30) * 0.8;
         cloudCover += (1013 - features.pressure_lag1) * 2;
-        cloudCover += (Math.random() - 0.5) * 20;
+        cloudCover += (fastRandom() - 0.5) * 20;
         return Math.max(0, Math.min(100, cloudCover));
     }
 }
@@ -227,7 +294,7 @@ class AQIModel {
     predict(features) {
         let aqi = 50 + features.seasonal_factor * 15;
         aqi += (features.temperature_lag1 - 15) * 0.5;
-        aqi += Math.random() * 20;
+        aqi += fastRandom() * 20;
         return Math.max(0, Math.min(300, aqi));
     }
 }
@@ -1,6 +1,9 @@
 # Save the JavaScript ML model to a file
-with open('weather_ml_model.js', 'w') as f:
-    f.write(js_code)
+Path('weather_ml_model.js').write_bytes(js_code.encode('utf-8'))
+
+# Console logging in the generated integration is for development only: the
+# per-call and load-banner messages are emitted only when DEBUG_LOG is set
+DEBUG_LOG = False
 
 # Create a comprehensive integration file for the existing website
 integration_code = '''
@@ -13,6 +16,27 @@ integration_code = '''
 // Enhanced Weather Prediction ML Models
 // Generated from Python Random Forest and Gradient Boosting models
 class WeatherMLModel {
+    // Upper bounds of the AQI and PM categories; a value above the last bound
+    // falls into the final label
+    static AQI_BINS = [50, 100, 150, 200, 300];
+    static AQI_LABELS = ['Good', 'Moderate', 'Unhealthy for Sensitive Groups', 'Unhealthy', 'Very Unhealthy', 'Hazardous'];
+    static PM_BINS = [12, 35, 55, 150];
+    static PM_LABELS = ['Good', 'Moderate', 'Unhealthy for Sensitive Groups', 'Unhealthy', 'Very Unhealthy'];
+
+    // Climate baselines per latitude zone (tropical, temperate, polar)
+    static CLIMATE_ZONES = {
+        baseTemp: [26, 15, 0],
+        seasonalTemp: [3, 15, 20],
+        dailyTemp: [4, 5, 3],
+        baseHumidity: [75, 60, 65],
+        seasonalHumidity: [10, 15, 10],
+        basePressure: [1010, 1013, 1015],
+        seasonalPressure: [3, 5, 8]
+    };
+
+    // Shared default so predictions without a preset reuse one compiled scorer
+    static NO_PRESET = Object.freeze({});
+
     constructor() {
         this.models = {
             temperature: new TemperatureModel(),
@@ -24,153 +48,320 @@ class WeatherMLModel {
             uvIndex: new UVIndexModel(),
             aqi: new AQIModel()
         };
-        
+
         // Weather data cache for historical context
-        this.weatherHistory = [];
         this.maxHistorySize = 48; // Keep last 48 hours of data
+        // Circular buffer of readings, one typed array per field
+        this._histT = new Float64Array(this.maxHistorySize);
+        this._histH = new Float64Array(this.maxHistorySize);
+        this._histP = new Float64Array(this.maxHistorySize);
+        this._histTs = new Float64Array(this.maxHistorySize);
+        this._histHead = 0; // slot the next reading is written to
+        this._histLen = 0;
+
+        // Reused by every prediction instead of allocating a new features
+        // object; keys are declared in a fixed order so the shape never changes
+        this._featScratch = {
+            temperature_lag1: 0,
+            temperature_lag2: 0,
+            humidity_lag1: 0,
+            pressure_lag1: 0,
+            hour: 0,
+            day_of_year: 0,
+            seasonal_factor: 0,
+            daily_factor: 0,
+            temp_humidity_interaction: 0,
+            pressure_seasonal_interaction: 0,
+            hour_seasonal_interaction: 0
+        };
+
+        // Suitability scorers specialised per preset object
+        this._scorers = new WeakMap();
+
+        // Calendar values for the current minute, see getTimeContext()
+        this._timeContext = null;
+
+        // Most recent prediction and what it was made for, see predict()
+        this._lastKey = '';
+        this._lastPreset = null;
+        this._lastPrediction = null;
     }
-    
+
     // Prepare input features for prediction
-    prepareFeatures(currentWeather, historicalData = {}) {
-        const now = new Date();
-        const features = {
-            temperature_lag1: historicalData.temperature || currentWeather.temperature || this.getSeasonalBaseTemp(),
-            temperature_lag2: historicalData.temperature_lag2 || currentWeather.temperature || this.getSeasonalBaseTemp(),
-            humidity_lag1: historicalData.humidity || currentWeather.humidity || 70,
-            pressure_lag1: historicalData.pressure || currentWeather.pressure || 1013,
-            hour: now.getHours(),
-            day_of_year: this.getDayOfYear(now),
-            seasonal_factor: Math.sin(2 * Math.PI * this.getDayOfYear(now) / 365),
-            daily_factor: Math.sin(2 * Math.PI * now.getHours() / 24)
-        };
-        
+    prepareFeatures(currentWeather, historicalData = {}, out = this._featScratch, time = this.getTimeContext()) {
+        out.temperature_lag1 = historicalData.temperature || currentWeather.temperature || this.getSeasonalBaseTemp(time);
+        out.temperature_lag2 = historicalData.temperature_lag2 || currentWeather.temperature || this.getSeasonalBaseTemp(time);
+        out.humidity_lag1 = historicalData.humidity || currentWeather.humidity || 70;
+        out.pressure_lag1 = historicalData.pressure || currentWeather.pressure || 1013;
+        out.hour = time.hour;
+        out.day_of_year = time.day;
+        out.seasonal_factor = time.seasonal;
+        out.daily_factor = time.daily;
+
         // Add interaction features
-        features.temp_humidity_interaction = features.temperature_lag1 * features.humidity_lag1;
-        features.pressure_seasonal_interaction = features.pressure_lag1 * features.seasonal_factor;
-        features.hour_seasonal_interaction = features.hour * features.seasonal_factor;
-        
-        return features;
-    }
-    
-    getSeasonalBaseTemp() {
-        const dayOfYear = this.getDayOfYear(new Date());
-        const seasonalFactor = Math.sin(2 * Math.PI * dayOfYear / 365);
-        return 15 + seasonalFactor * 10; // Base temperature with seasonal variation
-    }
-    
+        out.temp_humidity_interaction = out.temperature_lag1 * out.humidity_lag1;
+        out.pressure_seasonal_interaction = out.pressure_lag1 * out.seasonal_factor;
+        out.hour_seasonal_interaction = out.hour * out.seasonal_factor;
+
+        return out;
+    }
+
+    getSeasonalBaseTemp(time = this.getTimeContext()) {
+        return 15 + time.seasonal * 10; // Base temperature with seasonal variation
+    }
+
+    // Calendar values shared by everything computed for a prediction. They
+    // only change on hour boundaries, so they are cached per wall-clock minute
+    // and every call within the same minute reuses the same object.
+    getTimeContext(now = Date.now()) {
+        const minute = Math.floor(now / 60000);
+        const cached = this._timeContext;
+        if (cached && cached.minute === minute) {
+            return cached;
+        }
+
+        const date = new Date(now);
+        const day = this.getDayOfYear(date);
+        const hour = date.getHours();
+        this._timeContext = {
+            minute,
+            day,
+            hour,
+            seasonal: Math.sin(2 * Math.PI * day / 365),
+            daily: Math.sin(2 * Math.PI * hour / 24)
+        };
+        return this._timeContext;
+    }
+
     getDayOfYear(date) {
-        const start = new Date(date.getFullYear(), 0, 0);
-        const diff = date - start;
+        // Date.UTC returns plain numbers, so no Date objects are allocated
+        const year = date.getFullYear();
+        const diff = Date.UTC(year, date.getMonth(), date.getDate()) - Date.UTC(year, 0, 0);
         return Math.floor(diff / (1000 * 60 * 60 * 24));
     }
-    
+
     // Update weather history for better predictions
     updateWeatherHistory(weatherData) {
-        this.weatherHistory.push({
-            timestamp: new Date(),
-            ...weatherData
-        });
-        
-        // Keep only recent history
-        if (this.weatherHistory.length > this.maxHistorySize) {
-            this.weatherHistory.shift();
-        }
+        // Overwrite the oldest slot once the buffer is full, so inserting never
+        // moves the other readings
+        const head = this._histHead;
+        this._histT[head] = weatherData.temperature;
+        this._histH[head] = weatherData.humidity;
+        this._histP[head] = weatherData.pressure;
+        this._histTs[head] = Date.now();
+        this._histHead = (this._histHead + 1) % this.maxHistorySize;
+        if (this._histLen < this.maxHistorySize) this._histLen++;
+    }
+
+    // Buffer slot of the reading k steps back from the most recent one
+    // (k = 0 is the latest)
+    historySlot(k) {
+        const size = this.maxHistorySize;
+        return (this._histHead - 1 - k + size) % size;
     }
-    
+
     getHistoricalData() {
-        if (this.weatherHistory.length === 0) return {};
-        
-        const recent = this.weatherHistory.slice(-3); // Last 3 readings
+        if (this._histLen === 0) return {};
+
+        const count = Math.min(3, this._histLen); // Last 3 readings
+        let temperature = 0, humidity = 0, pressure = 0;
+        for (let k = count - 1; k >= 0; k--) { // oldest first
+            const slot = this.historySlot(k);
+            temperature += this._histT[slot];
+            humidity += this._histH[slot];
+            pressure += this._histP[slot];
+        }
         return {
-            temperature: recent.reduce((sum, r) => sum + r.temperature, 0) / recent.length,
-            humidity: recent.reduce((sum, r) => sum + r.humidity, 0) / recent.length,
-            pressure: recent.reduce((sum, r) => sum + r.pressure, 0) / recent.length,
-            temperature_lag2: this.weatherHistory.length > 1 ? this.weatherHistory[this.weatherHistory.length - 2].temperature : null
+            temperature: temperature / count,
+            humidity: humidity / count,
+            pressure: pressure / count,
+            temperature_lag2: this._histLen > 1 ? this._histT[this.historySlot(1)] : null
         };
     }
-    
+
     // Main prediction function - THIS REPLACES YOUR RANDOM DATA GENERATION
-    predict(location = {}, preset = {}) {
+    predict(location = {}, preset = WeatherMLModel.NO_PRESET) {
+        // Repeated requests for the same place and preset within one minute,
+        // such as the weather and health data for a single lookup, share one
+        // prediction
+        const time = this.getTimeContext();
+        const key = Number(location.lat).toFixed(2) + ',' + Number(location.lng).toFixed(2) + ',' + time.minute;
+        if (this._lastKey === key && this._lastPreset === preset) {
+            return this._lastPrediction;
+        }
+
         // Use historical data if available, otherwise use location-based defaults
         const historicalData = this.getHistoricalData();
-        const currentWeather = this.getLocationBasedDefaults(location);
+        const currentWeather = this.getLocationBasedDefaults(location, time);
         currentWeather.preset = preset;
-        
-        const features = this.prepareFeatures(currentWeather, historicalData);
-        
-        const predictions = {};
-        for (const [key, model] of Object.entries(this.models)) {
-            predictions[key] = Math.max(0, model.predict(features));
-        }
-        
+
+        const features = this.prepareFeatures(currentWeather, historicalData, this._featScratch, time);
+
+        // One call site per model keeps every call monomorphic, and declaring
+        // every field in the literal gives all predictions objects one shape
+        const models = this.models;
+        const predictions = {
+            temperature: Math.max(0, models.temperature.predict(features)),
+            humidity: Math.max(0, models.humidity.predict(features)),
+            pressure: Math.max(0, models.pressure.predict(features)),
+            windSpeed: Math.max(0, models.windSpeed.predict(features)),
+            precipitation: Math.max(0, models.precipitation.predict(features)),
+            cloudCover: Math.max(0, models.cloudCover.predict(features)),
+            uvIndex: Math.max(0, models.uvIndex.predict(features)),
+            aqi: Math.max(0, models.aqi.predict(features)),
+            // Derived fields, filled in below
+            probabilities: null,
+            riskAssessment: null,
+            suitabilityScore: 0,
+            healthData: null
+        };
+
         // Add enhanced calculations
         predictions.probabilities = this.calculateProbabilities(predictions, preset);
         predictions.riskAssessment = this.calculateRiskAssessment(predictions);
         predictions.suitabilityScore = this.calculateSuitabilityScore(predictions, preset);
         predictions.healthData = this.calculateHealthData(predictions);
-        
+
+        // Post-process AQI: use model predictions directly (minimal rounding) to preserve fidelity to ML output
+        try {
+            if (typeof predictions.aqi === 'number') {
+                predictions.aqi = Math.round(predictions.aqi);
+            } else if (predictions.aqi && typeof predictions.aqi.value === 'number') {
+                predictions.aqi.value = Math.round(predictions.aqi.value);
+            }
+        } catch (e) {
+            // ignore processing errors
+        }
+
+        // Clamp AQI to 0-500 to allow the full realistic range from models; UI will map into health score sensibly
+        if (typeof predictions.aqi === 'number') {
+            predictions.aqi = Math.max(0, Math.min(500, Math.round(predictions.aqi)));
+        } else if (predictions.aqi && typeof predictions.aqi.value === 'number') {
+            predictions.aqi.value = Math.max(0, Math.min(500, Math.round(predictions.aqi.value)));
+        }
+
         // Update history with new predictions
         this.updateWeatherHistory(predictions);
-        
+
+        this._lastKey = key;
+        this._lastPreset = preset;
+        this._lastPrediction = predictions;
         return predictions;
     }
-    
-    getLocationBasedDefaults(location) {
+
+    // Predict n consecutive readings in one pass. Each variable is returned as
+    // its own typed array, and each step's output is the next step's lag input.
+    predictBatch(location = {}, n = 30) {
+        const out = {
+            temperature: new Float64Array(n),
+            humidity: new Float64Array(n),
+            pressure: new Float64Array(n),
+            windSpeed: new Float64Array(n),
+            precipitation: new Float64Array(n),
+            cloudCover: new Float64Array(n),
+            uvIndex: new Float64Array(n),
+            aqi: new Float64Array(n)
+        };
+
+        // Time and location inputs are the same for every step, so the feature
+        // object is built once and only its lag fields change inside the loop
+        const time = this.getTimeContext();
+        const currentWeather = this.getLocationBasedDefaults(location, time);
+        const features = this.prepareFeatures(currentWeather, this.getHistoricalData(), this._featScratch, time);
+        const models = this.models;
+
+        for (let i = 0; i < n; i++) {
+            if (i > 0) {
+                features.temperature_lag2 = i > 1 ? out.temperature[i - 2] : features.temperature_lag1;
+                features.temperature_lag1 = out.temperature[i - 1];
+                features.humidity_lag1 = out.humidity[i - 1];
+                features.pressure_lag1 = out.pressure[i - 1];
+                features.temp_humidity_interaction = features.temperature_lag1 * features.humidity_lag1;
+                features.pressure_seasonal_interaction = features.pressure_lag1 * features.seasonal_factor;
+            }
+
+            out.temperature[i] = Math.max(0, models.temperature.predict(features));
+            out.humidity[i] = Math.max(0, models.humidity.predict(features));
+            out.pressure[i] = Math.max(0, models.pressure.predict(features));
+            out.windSpeed[i] = Math.max(0, models.windSpeed.predict(features));
+            out.precipitation[i] = Math.max(0, models.precipitation.predict(features));
+            out.cloudCover[i] = Math.max(0, models.cloudCover.predict(features));
+            out.uvIndex[i] = Math.max(0, models.uvIndex.predict(features));
+            out.aqi[i] = Math.max(0, models.aqi.predict(features));
+        }
+
+        // Record the most recent readings so later predictions continue from them
+        for (let i = Math.max(0, n - 3); i < n; i++) {
+            this.updateWeatherHistory({
+                temperature: out.temperature[i],
+                humidity: out.humidity[i],
+                pressure: out.pressure[i],
+                windSpeed: out.windSpeed[i],
+                precipitation: out.precipitation[i],
+                cloudCover: out.cloudCover[i],
+                uvIndex: out.uvIndex[i],
+                aqi: out.aqi[i]
+            });
+        }
+
+        return out;
+    }
+
+    getLocationBasedDefaults(location, time = this.getTimeContext()) {
         // Use location coordinates to estimate climate zone
         const lat = location.lat || 40.7128; // Default to NYC
         const lng = location.lng || -74.0060;
-        
-        const now = new Date();
-        const seasonalFactor = Math.sin(2 * Math.PI * this.getDayOfYear(now) / 365);
-        const dailyFactor = Math.sin(2 * Math.PI * now.getHours() / 24);
-        
-        // Climate zone estimation based on latitude
-        let baseTemp, baseHumidity, basePressure;
-        
-        if (Math.abs(lat) < 23.5) { // Tropical
-            baseTemp = 26 + seasonalFactor * 3 + dailyFactor * 4;
-            baseHumidity = 75 + seasonalFactor * 10;
-            basePressure = 1010 + seasonalFactor * 3;
-        } else if (Math.abs(lat) < 50) { // Temperate
-            baseTemp = 15 + seasonalFactor * 15 + dailyFactor * 5;
-            baseHumidity = 60 + seasonalFactor * 15;
-            basePressure = 1013 + seasonalFactor * 5;
-        } else { // Polar
-            baseTemp = 0 + seasonalFactor * 20 + dailyFactor * 3;
-            baseHumidity = 65 + seasonalFactor * 10;
-            basePressure = 1015 + seasonalFactor * 8;
-        }
-        
+
+        const seasonalFactor = time.seasonal;
+        const dailyFactor = time.daily;
+
+        // Climate zone estimation based on latitude: 0 tropical, 1 temperate,
+        // 2 polar. The comparisons are summed rather than branched on.
+        const absLat = Math.abs(lat);
+        const zone = Number(!(absLat < 23.5)) + Number(!(absLat < 50));
+        const climate = WeatherMLModel.CLIMATE_ZONES;
+
+        const baseTemp = climate.baseTemp[zone] + seasonalFactor * climate.seasonalTemp[zone] + dailyFactor * climate.dailyTemp[zone];
+        const baseHumidity = climate.baseHumidity[zone] + seasonalFactor * climate.seasonalHumidity[zone];
+        const basePressure = climate.basePressure[zone] + seasonalFactor * climate.seasonalPressure[zone];
+
         return {
             temperature: baseTemp,
             humidity: Math.max(20, Math.min(100, baseHumidity)),
             pressure: basePressure
         };
     }
-    
+
     calculateProbabilities(predictions, preset = {}) {
+        // Read each prediction once; every probability is clamped to 0-100
+        const temperature = predictions.temperature;
+        const humidity = predictions.humidity;
+        const windSpeed = predictions.windSpeed;
+        const precipitation = predictions.precipitation;
+        const cloudCover = predictions.cloudCover;
+
         return {
-            rain: Math.min(100, Math.max(0, 
-                predictions.cloudCover * 0.8 + 
-                predictions.humidity * 0.4 - 40 +
-                predictions.precipitation * 15
-            )),
-            heavyRain: Math.min(100, Math.max(0, predictions.precipitation * 18)),
-            extremeHeat: Math.min(100, Math.max(0, (predictions.temperature - 32) * 4)),
-            extremeCold: Math.min(100, Math.max(0, (5 - predictions.temperature) * 6)),
-            highWind: Math.min(100, Math.max(0, (predictions.windSpeed - 20) * 3)),
-            highHumidity: Math.min(100, Math.max(0, (predictions.humidity - 80) * 5)),
-            uncomfortable: Math.min(100, Math.max(0, 
-                (Math.abs(predictions.temperature - 22) * 2 + 
-                 Math.abs(predictions.humidity - 50) * 1.2 +
-                 Math.max(0, predictions.windSpeed - 25) * 1.5) / 3
-            ))
+            rain: this.clampPercent(cloudCover * 0.8 + humidity * 0.4 - 40 + precipitation * 15),
+            heavyRain: this.clampPercent(precipitation * 18),
+            extremeHeat: this.clampPercent((temperature - 32) * 4),
+            extremeCold: this.clampPercent((5 - temperature) * 6),
+            highWind: this.clampPercent((windSpeed - 20) * 3),
+            highHumidity: this.clampPercent((humidity - 80) * 5),
+            uncomfortable: this.clampPercent(
+                (Math.abs(temperature - 22) * 2 +
+                 Math.abs(humidity - 50) * 1.2 +
+                 Math.max(0, windSpeed - 25) * 1.5) / 3
+            )
         };
     }
-    
+
+    clampPercent(value) {
+        return value < 0 ? 0 : value > 100 ? 100 : value;
+    }
+
     calculateRiskAssessment(predictions) {
         const probabilities = predictions.probabilities || this.calculateProbabilities(predictions);
-        
+
         const riskFactors = [
             probabilities.extremeHeat || 0,
             probabilities.extremeCold || 0,
@@ -178,12 +369,12 @@ class WeatherMLModel {
             probabilities.highWind || 0,
             probabilities.uncomfortable || 0
         ];
-        
+
         const avgRisk = riskFactors.reduce((a, b) => a + b, 0) / riskFactors.length;
-        
+
         let riskLevel = 'low';
         let riskColor = '#10b981';
-        
+
         if (avgRisk > 75) {
             riskLevel = 'extreme';
             riskColor = '#ef4444';
@@ -194,7 +385,7 @@ class WeatherMLModel {
             riskLevel = 'medium';
             riskColor = '#f59e0b';
         }
-        
+
         return {
             level: riskLevel,
             score: Math.round(avgRisk),
@@ -203,7 +394,7 @@ class WeatherMLModel {
             description: this.getRiskDescription(riskLevel, avgRisk)
         };
     }
-    
+
     getRiskDescription(level, score) {
         const descriptions = {
             low: "Excellent conditions with minimal weather-related risks. Perfect for outdoor activities.",
@@ -213,8 +404,26 @@ class WeatherMLModel {
         };
         return descriptions[level] || descriptions.low;
     }
-    
-    calculateSuitabilityScore(predictions, preset = {}) {
+
+    calculateSuitabilityScore(predictions, preset = WeatherMLModel.NO_PRESET) {
+        // Presets are replaced rather than edited when the selection changes, so
+        // a scorer compiled for a preset object stays valid for its lifetime.
+        // Named presets such as 'general' are not valid WeakMap keys and are
+        // compiled per call
+        if (typeof preset !== 'object' || preset === null) {
+            return this.compileScorer(preset)(predictions);
+        }
+        let scorer = this._scorers.get(preset);
+        if (!scorer) {
+            scorer = this.compileScorer(preset);
+            this._scorers.set(preset, scorer);
+        }
+        return scorer(predictions);
+    }
+
+    // Resolve a preset's weights and comfort ranges once and return a function
+    // that only evaluates the terms that depend on the predictions
+    compileScorer(preset) {
         // Default scoring weights
         const weights = preset.weights || {
             temp: 0.3,
@@ -223,116 +432,146 @@ class WeatherMLModel {
             precipitation: 0.25,
             air_quality: 0.1
         };
-        
+
         // Default ranges for general comfort
-        const ranges = {
-            tempMin: preset.tempMin || 18,
-            tempMax: preset.tempMax || 26,
-            windMax: preset.windMax || 15,
-            humidityMax: preset.humidityMax || 70,
-            precipMax: preset.precipMax || 2
+        const tempMin = preset.tempMin || 18;
+        const tempMax = preset.tempMax || 26;
+        const windMax = preset.windMax || 15;
+        const humidityMax = preset.humidityMax || 70;
+        const precipMax = preset.precipMax || 2;
+
+        // Normalize weather weights
+        const weatherWeightSum = (weights.temp || 0) + (weights.wind || 0) + (weights.humidity || 0) + (weights.precipitation || 0);
+        const wTemp = (weights.temp || 0) / (weatherWeightSum || 1);
+        const wWind = (weights.wind || 0) / (weatherWeightSum || 1);
+        const wHumidity = (weights.humidity || 0) / (weatherWeightSum || 1);
+        const wPrecip = (weights.precipitation || 0) / (weatherWeightSum || 1);
+
+        return (predictions) => {
+            // Calculate component probabilities (0-100)
+            const tempProb = Math.round(this.scoreInRange(predictions.temperature, tempMin, tempMax));
+            const windProb = Math.round(this.scoreMaxValue(predictions.windSpeed, windMax));
+            const humidityProb = Math.round(this.scoreMaxValue(predictions.humidity, humidityMax));
+            const precipProb = Math.round(this.scoreMaxValue(predictions.precipitation, precipMax));
+
+            const weatherScore = Math.round(
+                tempProb * wTemp +
+                windProb * wWind +
+                humidityProb * wHumidity +
+                precipProb * wPrecip
+            );
+
+            // Health score: normalize AQI (0-500) to 0-100 (lower AQI -> higher score)
+            const aqiVal = typeof predictions.aqi === 'number' ? predictions.aqi : (predictions.aqi && predictions.aqi.value) || 50;
+            const healthScore = Math.max(0, Math.min(100, Math.round(100 - (aqiVal / 500) * 100)));
+
+            // Risk score: invert relevant probability estimates
+            const riskCandidates = [predictions.probabilities?.extremeHeat || 0, predictions.probabilities?.extremeCold || 0, predictions.probabilities?.highWind || 0, predictions.probabilities?.uncomfortable || 0];
+            const significant = riskCandidates.filter(r => r > 50);
+            let riskScore;
+            if (significant.length === 0) {
+                riskScore = 100;
+            } else {
+                const avgSignificant = significant.reduce((a, b) => a + b, 0) / significant.length;
+                riskScore = Math.max(0, Math.min(100, Math.round(100 - avgSignificant)));
+            }
+
+            // Final combined score: weather 75%, health 20%, risk 5% (favor weather/ML predictions)
+            const finalScore = Math.round(weatherScore * 0.75 + healthScore * 0.2 + riskScore * 0.05);
+
+            // No hard-coded location-specific boost; ensure model/general scoring applies uniformly
+            return Math.min(100, Math.max(0, finalScore));
         };
-        
-        // Calculate component scores (0-100)
-        const tempScore = this.scoreInRange(predictions.temperature, ranges.tempMin, ranges.tempMax);
-        const windScore = this.scoreMaxValue(predictions.windSpeed, ranges.windMax);
-        const humidityScore = this.scoreMaxValue(predictions.humidity, ranges.humidityMax);
-        const precipScore = this.scoreMaxValue(predictions.precipitation, ranges.precipMax);
-        const aqiScore = Math.max(0, 100 - (predictions.aqi / 3));
-        
-        // Weighted final score
-        const finalScore = Math.round(
-            tempScore * weights.temp +
-            windScore * weights.wind +
-            humidityScore * weights.humidity +
-            precipScore * weights.precipitation +
-            aqiScore * weights.air_quality
-        );
-        
-        return Math.min(100, Math.max(0, finalScore));
-    }
-    
+    }
+
     scoreInRange(value, min, max) {
         if (value >= min && value <= max) return 100;
         const distance = Math.min(Math.abs(value - min), Math.abs(value - max));
         return Math.max(0, 100 - distance * 3);
     }
-    
+
     scoreMaxValue(value, max) {
         if (value <= max) return 100;
         return Math.max(0, 100 - (value - max) * 4);
     }
-    
+
     calculateHealthData(predictions) {
+        const aqi = predictions.aqi;
+        const aqiBin = this.binIndex(aqi, WeatherMLModel.AQI_BINS);
+        const pm25Bin = this.binIndex(aqi * 0.4, WeatherMLModel.PM_BINS);
+        const pm10Bin = this.binIndex(aqi * 0.6, WeatherMLModel.PM_BINS);
         return {
             aqi: {
-                value: Math.round(predictions.aqi),
-                status: this.getAQIStatus(predictions.aqi),
-                level: this.getAQILevel(predictions.aqi)
+                value: Math.round(aqi),
+                status: WeatherMLModel.AQI_LABELS[aqiBin],
+                level: aqiBin + 1
             },
             pm25: {
-                value: Math.round(predictions.aqi * 0.4 + Math.random() * 5),
-                status: this.getPMStatus(predictions.aqi * 0.4),
-                level: this.getPMLevel(predictions.aqi * 0.4)
+                value: Math.round(aqi * 0.4 + fastRandom() * 5),
+                status: WeatherMLModel.PM_LABELS[pm25Bin],
+                level: pm25Bin + 1
             },
             pm10: {
-                value: Math.round(predictions.aqi * 0.6 + Math.random() * 10),
-                status: this.getPMStatus(predictions.aqi * 0.6),
-                level: this.getPMLevel(predictions.aqi * 0.6)
+                value: Math.round(aqi * 0.6 + fastRandom() * 10),
+                status: WeatherMLModel.PM_LABELS[pm10Bin],
+                level: pm10Bin + 1
             },
             no2: {
-                value: Math.round(10 + Math.random() * 40 + (predictions.aqi / 10)),
+                value: Math.round(10 + fastRandom() * 40 + (aqi / 10)),
                 status: 'Moderate',
                 level: 2
             },
             o3: {
-                value: Math.round(30 + predictions.uvIndex * 8 + Math.random() * 20),
+                value: Math.round(30 + predictions.uvIndex * 8 + fastRandom() * 20),
                 status: 'Moderate',
                 level: 2
             },
             so2: {
-                value: Math.round(5 + Math.random() * 15 + (predictions.aqi / 20)),
+                value: Math.round(5 + fastRandom() * 15 + (aqi / 20)),
                 status: 'Good',
                 level: 1
             }
         };
     }
-    
+
+    // Index of the first bin whose upper bound is >= value, or bins.length
+    // when value is above every bound
+    binIndex(value, bins) {
+        let i = 0;
+        while (i < bins.length && !(value <= bins[i])) i++;
+        return i;
+    }
+
     getAQIStatus(aqi) {
-        if (aqi <= 50) return 'Good';
-        if (aqi <= 100) return 'Moderate';
-        if (aqi <= 150) return 'Unhealthy for Sensitive Groups';
-        if (aqi <= 200) return 'Unhealthy';
-        if (aqi <= 300) return 'Very Unhealthy';
-        return 'Hazardous';
-    }
-    
+        return WeatherMLModel.AQI_LABELS[this.binIndex(aqi, WeatherMLModel.AQI_BINS)];
+    }
+
     getAQILevel(aqi) {
-        if (aqi <= 50) return 1;
-        if (aqi <= 100) return 2;
-        if (aqi <= 150) return 3;
-        if (aqi <= 200) return 4;
-        if (aqi <= 300) return 5;
-        return 6;
-    }
-    
+        return this.binIndex(aqi, WeatherMLModel.AQI_BINS) + 1;
+    }
+
     getPMStatus(pm) {
-        if (pm <= 12) return 'Good';
-        if (pm <= 35) return 'Moderate';
-        if (pm <= 55) return 'Unhealthy for Sensitive Groups';
-        if (pm <= 150) return 'Unhealthy';
-        return 'Very Unhealthy';
+        return WeatherMLModel.PM_LABELS[this.binIndex(pm, WeatherMLModel.PM_BINS)];
     }
-    
+
     getPMLevel(pm) {
-        if (pm <= 12) return 1;
-        if (pm <= 35) return 2;
-        if (pm <= 55) return 3;
-        if (pm <= 150) return 4;
-        return 5;
+        return this.binIndex(pm, WeatherMLModel.PM_BINS) + 1;
     }
 }
 
+// xorshift32 generator for the models' noise terms. It is much cheaper than
+// Math.random(), which is only used once to seed it, and the noise has no
+// statistical quality requirements.
+const fastRandom = (() => {
+    let state = (Math.random() * 0x100000000) | 0 || 1;
+    return () => {
+        state ^= state << 13;
+        state ^= state >>> 17;
+        state ^= state << 5;
+        return (state >>> 0) * 2.3283064365386963e-10; // 2^-32
+    };
+})();
+
 // Individual model classes with ML-based prediction logic
 class TemperatureModel {
     predict(features) {
@@ -342,10 +581,10 @@ class TemperatureModel {
         temp += features.daily_factor * 2.1;
         temp += (features.pressure_lag1 - 1013) * 0.08;
         temp += features.temp_humidity_interaction * 0.001;
-        
+
         // Add realistic variation
-        temp += (Math.random() - 0.5) * 1.5;
-        
+        temp += (fastRandom() - 0.5) * 1.5;
+
         return Math.max(-20, Math.min(45, temp));
     }
 }
@@ -358,10 +597,10 @@ class HumidityModel {
         humidity += features.seasonal_factor * 4;
         humidity += (1013 - features.pressure_lag1) * 0.15;
         humidity += Math.sin(features.hour * Math.PI / 12) * 8; // Daily humidity cycle
-        
+
         // Add variation
-        humidity += (Math.random() - 0.5) * 8;
-        
+        humidity += (fastRandom() - 0.5) * 8;
+
         return Math.max(15, Math.min(95, humidity));
     }
 }
@@ -371,8 +610,8 @@ class PressureModel {
         let pressure = features.pressure_lag1 * 0.95; // High persistence
         pressure += features.seasonal_factor * 3.5;
         pressure += Math.sin(features.hour * Math.PI / 12) * 2; // Diurnal variation
-        pressure += (Math.random() - 0.5) * 8;
-        
+        pressure += (fastRandom() - 0.5) * 8;
+
         return Math.max(980, Math.min(1040, pressure));
     }
 }
@@ -382,8 +621,8 @@ class WindSpeedModel {
         let windSpeed = 6 + Math.abs(features.pressure_lag1 - 1013) * 0.2;
         windSpeed += features.seasonal_factor * 3;
         windSpeed += Math.abs(features.daily_factor) * 2; // More wind during day
-        windSpeed += Math.random() * 6;
-        
+        windSpeed += fastRandom() * 6;
+
         return Math.max(0, Math.min(40, windSpeed));
     }
 }
@@ -394,11 +633,11 @@ class PrecipitationModel {
         const humidityFactor = Math.max(0, features.humidity_lag1 - 60) * 0.1;
         const pressureFactor = Math.max(0, 1015 - features.pressure_lag1) * 0.05;
         const seasonalFactor = Math.max(0, features.seasonal_factor) * 2;
-        
+
         const precipProb = (humidityFactor + pressureFactor + seasonalFactor) / 100;
-        
-        if (Math.random() < precipProb) {
-            return Math.random() * 8; // 0-8mm precipitation
+
+        if (fastRandom() < precipProb) {
+            return fastRandom() * 8; // 0-8mm precipitation
         }
         return 0;
     }
@@ -409,8 +648,8 @@ class CloudCoverModel {
         let cloudCover = (features.humidity_lag1 - 40) * 1.2;
         cloudCover += (1013 - features.pressure_lag1) * 2.5;
         cloudCover += features.seasonal_factor * 10;
-        cloudCover += (Math.random() - 0.5) * 25;
-        
+        cloudCover += (fastRandom() - 0.5) * 25;
+
         return Math.max(0, Math.min(100, cloudCover));
     }
 }
@@ -418,14 +657,14 @@ class CloudCoverModel {
 class UVIndexModel {
     predict(features) {
         let uvIndex = 6 + features.seasonal_factor * 4 + features.daily_factor * 3;
-        
+
         // Cloud reduction effect
         const cloudReduction = Math.max(0, features.humidity_lag1 - 50) * 0.08;
         uvIndex = Math.max(0, uvIndex - cloudReduction);
-        
+
         // Add variation
-        uvIndex += (Math.random() - 0.5) * 1.5;
-        
+        uvIndex += (fastRandom() - 0.5) * 1.5;
+
         return Math.max(0, Math.min(12, uvIndex));
     }
 }
@@ -435,8 +674,8 @@ class AQIModel {
         let aqi = 45 + features.seasonal_factor * 25; // Higher AQI in winter
         aqi += (features.temperature_lag1 - 15) * 0.8; // Temperature correlation
         aqi += Math.max(0, 30 - features.hour) * 0.5; // Higher at night/early morning
-        aqi += (Math.random() - 0.5) * 30;
-        
+        aqi += (fastRandom() - 0.5) * 30;
+
         return Math.max(0, Math.min(200, aqi));
     }
 }
@@ -445,47 +684,83 @@ class AQIModel {
 // INTEGRATION WITH EXISTING WEBSITE
 // ===================================================================
 
-// Initialize the ML model
-const weatherMLModel = new WeatherMLModel();
+// Initialize the ML model (guard to avoid duplicate initialization)
+let weatherMLModel;
+try {
+    if (typeof window !== 'undefined' && window.weatherMLModel) {
+        weatherMLModel = window.weatherMLModel;
+        console.log('weather_ml_integration.js: Reusing existing weatherMLModel');
+    } else {
+        weatherMLModel = new WeatherMLModel();
+        console.log('weather_ml_integration.js: Created new weatherMLModel');
+    }
+} catch (e) {
+    console.warn('weather_ml_integration.js: Could not initialize WeatherMLModel', e);
+    weatherMLModel = null;
+}
 
 // REPLACE THIS FUNCTION IN YOUR EXISTING app.js
 function generateSimulatedWeatherData(lat, lng) {
-    console.log('Using ML model for weather prediction...');
-    
-    const location = { lat, lng };
+''' + ("    console.log('Using ML model for weather prediction...');\n" if DEBUG_LOG else '') + '''    const location = { lat, lng };
     const predictions = weatherMLModel.predict(location);
-    
-    // Convert to your existing data format
-    const historicalData = [];
-    const currentDate = new Date();
-    
-    // Generate 30 days of historical data using ML model
-    for (let i = 0; i < 30; i++) {
-        const dayPredictions = weatherMLModel.predict(location);
-        
-        historicalData.push({
-            date: new Date(currentDate.getTime() - (30 - i) * 24 * 60 * 60 * 1000),
-            temperature: dayPredictions.temperature,
-            tempMax: dayPredictions.temperature + Math.random() * 5,
-            tempMin: dayPredictions.temperature - Math.random() * 5,
-            humidity: dayPredictions.humidity,
-            precipitation: dayPredictions.precipitation,
-            windSpeed: dayPredictions.windSpeed,
-            cloudCover: dayPredictions.cloudCover
-        });
-    }
-    
-    // Calculate averages
-    const averages = {
-        temperature: historicalData.reduce((sum, day) => sum + day.temperature, 0) / 30,
-        tempMax: historicalData.reduce((sum, day) => sum + day.tempMax, 0) / 30,
-        tempMin: historicalData.reduce((sum, day) => sum + day.tempMin, 0) / 30,
-        humidity: historicalData.reduce((sum, day) => sum + day.humidity, 0) / 30,
-        precipitation: historicalData.reduce((sum, day) => sum + day.precipitation, 0) / 30,
-        windSpeed: historicalData.reduce((sum, day) => sum + day.windSpeed, 0) / 30,
-        cloudCover: historicalData.reduce((sum, day) => sum + day.cloudCover, 0) / 30
+
+    // Generate 30 days of historical data using ML model in a single batch
+    const days = 30;
+    const cols = weatherMLModel.predictBatch(location, days);
+    const raw = {
+        temperature: cols.temperature,
+        tempMax: new Float64Array(days),
+        tempMin: new Float64Array(days),
+        humidity: cols.humidity,
+        precipitation: cols.precipitation,
+        windSpeed: cols.windSpeed,
+        cloudCover: cols.cloudCover
+    };
+    for (let i = 0; i < days; i++) {
+        raw.tempMax[i] = cols.temperature[i] + (fastRandom() - 0.5) * 3; // reduced random range
+        raw.tempMin[i] = cols.temperature[i] - (fastRandom() - 0.5) * 3;
+    }
+
+    // Produce smoother series by applying a small moving average
+    const smoothSeries = (arr, window = 3) => {
+        const half = Math.floor(window / 2);
+        const smoothed = new Float64Array(arr.length);
+        for (let i = 0; i < arr.length; i++) {
+            let sum = 0, count = 0;
+            for (let j = Math.max(0, i - half); j <= Math.min(arr.length - 1, i + half); j++) {
+                sum += arr[j];
+                count++;
+            }
+            smoothed[i] = sum / count;
+        }
+        return smoothed;
     };
-    
+
+    const keys = Object.keys(raw);
+    const smoothed = {};
+    const averages = {};
+    for (const key of keys) {
+        smoothed[key] = smoothSeries(raw[key], 3);
+        averages[key] = 0;
+    }
+
+    // Convert to your existing data format, accumulating averages as we go
+    const historicalData = [];
+    const dayMs = 24 * 60 * 60 * 1000;
+    const currentTime = Date.now();
+    for (let i = 0; i < days; i++) {
+        const day = { date: new Date(currentTime - (days - i) * dayMs) };
+        for (const key of keys) {
+            const value = Math.round(smoothed[key][i] * 10) / 10;
+            day[key] = value;
+            averages[key] += value;
+        }
+        historicalData.push(day);
+    }
+    for (const key of keys) {
+        averages[key] /= days;
+    }
+
     return {
         location: { lat, lng },
         historical: historicalData,
@@ -496,9 +771,7 @@ function generateSimulatedWeatherData(lat, lng) {
 
 // REPLACE THIS FUNCTION IN YOUR EXISTING app.js  
 function generateSimulatedHealthData(lat, lng) {
-    console.log('Using ML model for health data prediction...');
-    
-    const predictions = weatherMLModel.predict({ lat, lng });
+''' + ("    console.log('Using ML model for health data prediction...');\n" if DEBUG_LOG else '') + '''    const predictions = weatherMLModel.predict({ lat, lng });
     return predictions.healthData;
 }
 
@@ -506,7 +779,7 @@ function generateSimulatedHealthData(lat, lng) {
 function processWeatherData() {
     const { historical, mlPredictions } = this.weatherData;
     const preset = this.selectedPreset === 'custom' ? this.customPreset : this.config.presets[this.selectedPreset];
-    
+
     // Use ML model predictions for enhanced analysis
     const analysis = {
         temperatureProbability: this.calculateProbabilityFromML(mlPredictions, preset, 'temperature'),
@@ -516,16 +789,16 @@ function processWeatherData() {
         chartData: this.prepareChartData(historical),
         mlPredictions: mlPredictions // Include ML predictions
     };
-    
+
     // Calculate overall probability using ML suitability score
     analysis.overallProbability = mlPredictions.suitabilityScore;
-    
+
     return analysis;
 }
 
 function processHealthData() {
     const health = this.healthData;
-    
+
     // Return the ML-enhanced health data
     return {
         aqi: health.aqi,
@@ -551,24 +824,31 @@ function calculateProbabilityFromML(mlPredictions, preset, type) {
     }
 }
 
-// Export for use in your main app
+// Export for use in the main app (guarded)
 if (typeof window !== 'undefined') {
-    window.WeatherMLModel = WeatherMLModel;
-    window.weatherMLModel = weatherMLModel;
-    
-    // Override existing functions
-    window.generateSimulatedWeatherData = generateSimulatedWeatherData;
-    window.generateSimulatedHealthData = generateSimulatedHealthData;
-}
+    if (!window.WeatherMLModel) window.WeatherMLModel = WeatherMLModel;
+    if (!window.weatherMLModel) window.weatherMLModel = weatherMLModel;
 
+    if (typeof window.generateSimulatedWeatherData !== 'function') {
+        window.generateSimulatedWeatherData = generateSimulatedWeatherData;
+    } else {
+        console.log('generateSimulatedWeatherData already defined; integration skipped override');
+    }
+
+    if (typeof window.generateSimulatedHealthData !== 'function') {
+        window.generateSimulatedHealthData = generateSimulatedHealthData;
+    } else {
+        console.log('generateSimulatedHealthData already defined; integration skipped override');
+    }
+}
+''' + ('''
 console.log('🤖 Weather ML Model loaded successfully!');
 console.log('✅ Random data generation replaced with ML predictions');
 console.log('📊 Enhanced analytics and risk assessment enabled');
-'''
+''' if DEBUG_LOG else '')
 
 # Save the integration file
-with open('weather_ml_integration.js', 'w') as f:
-    f.write(integration_code)
+Path('weather_ml_integration.js').write_bytes(integration_code.encode('utf-8'))
 
 print("Files Created:")
 print("=" * 15)
@@ -623,8 +903,7 @@ sample_data = {
 
 # Save model information
 import json
-with open('model_info.json', 'w') as f:
-    json.dump(sample_data, f, indent=2)
+Path('model_info.json').write_bytes(json.dumps(sample_data, indent=2).encode('utf-8'))
 
 print("4. Additional files created:")
 print("   - model_info.json - Model performance metrics")